@@ -1,6 +1,59 @@
-import pandas as pd
+import functools
+import io
+import sys
 import numpy as np
 
+# Buffer size used when streaming the LaTeX output to disk. Nothing in the
+# write path flushes explicitly, so rows reach the OS in large blocks.
+_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Number of values formatted per %-operation when writing numeric arrays. Only
+# one chunk is ever converted to Python floats at a time.
+_FORMAT_CHUNK_CELLS = 8192
+
+# Template for a single plot line in the axis environment.
+_PLOT_TMPL = (
+    "    \\addplot[{opts}] table [x={x}, y={y}, col sep=space] {{{file}}};\n"
+    "    \\addlegendentry{{{legend}}};\n\n"
+)
+
+
+def _is_real_dtype(dtype):
+    """Return True for plain NumPy integer and floating dtypes."""
+    return isinstance(dtype, np.dtype) and (
+        np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.floating)
+    )
+
+
+def _uses_str(dtype, precision):
+    """
+    Return True for float dtypes other than float64 written without a precision.
+    Their values are converted with astype(str), which gives the shortest round-trip text
+    for the dtype itself; %r on the upcast Python float would print float64 noise.
+    """
+    return precision is None and np.issubdtype(dtype, np.floating) and dtype != np.float64
+
+
+def _value_format(dtype, precision):
+    """
+    Return the %-directive for one value of the given dtype. Integers are always exact;
+    floats use repr (shortest round-trip) unless a precision is given.
+    """
+    if np.issubdtype(dtype, np.integer):
+        return "%d"
+    if _uses_str(dtype, precision):
+        return "%s"
+    if precision is None:
+        return "%r"
+    return f"%.{precision}g"
+
+
+@functools.lru_cache(maxsize=32)
+def _chunk_format(row_fmt, nrows):
+    """Return the %-template for nrows rows formatted with row_fmt."""
+    return row_fmt * nrows
+
+
 class PyTikzPlot:
     """
     A class to generate LaTeX code for a plot using pgfplots.
@@ -23,16 +76,35 @@ class PyTikzPlot:
     The class accepts data as a pandas DataFrame, dict, NumPy array, or list-of-lists.
     For NumPy arrays and list-of-lists a header must be provided.
     The generated LaTeX code includes a filecontents* block with the data and a tikzpicture
-    environment with the specified axis options and plot commands.
+    environment with the specified axis options and plot commands. With external_data=True
+    the data is instead written to data_filename and the LaTeX code holds only the tikzpicture.
+    Floats are written exactly by default. Passing `precision` rounds them to that many
+    significant digits to shrink the data block; integers are always written exactly.
     """
 
-    def __init__(self, data, data_filename, latex_filename, header=None):
+    def __init__(self, data, data_filename, latex_filename, header=None, external_data=False, precision=None):
         self.data = data
         self.data_filename = data_filename
         self.latex_filename = latex_filename
         self.header = header  # Only used for NumPy arrays or list-of-lists.
+        self.external_data = external_data  # Write data to data_filename instead of a filecontents* block.
+        self.precision = precision  # Significant digits for floats; None writes them exactly.
         self.axis_options = {}   # Axis options for the plot.
+        self._axis_cache = None  # (axis option items, formatted axis options) from the last build.
         self.plot_lines = []     # Each plot line is stored as a dict.
+        self._numeric_df = None  # Cached result of the DataFrame dtype check.
+
+        # Pick the data writer once; self.data is not expected to change type afterwards.
+        # pandas is never imported here: a DataFrame can only exist if pandas is already loaded.
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(data, pd.DataFrame):
+            self._write_data = self._write_dataframe
+        elif isinstance(data, dict):
+            self._write_data = self._write_dict
+        elif isinstance(data, (np.ndarray, list)):
+            self._write_data = self._write_sequence
+        else:
+            raise TypeError("Unsupported data type. Provide a pandas DataFrame, dict, or numpy array/list-of-lists.")
 
     # --- Axis configuration methods ---
     def set_title(self, title):
@@ -93,6 +165,7 @@ class PyTikzPlot:
             "table_y": table_y,
             "legend": legend,
             "options": line_options,  # stored as dict
+            "options_str": self._format_options(line_options),
             "comment": comment
         })
 
@@ -104,82 +177,203 @@ class PyTikzPlot:
         if not options:
             return ""
         parts = []
+        append = parts.append
         for key, value in options.items():
-            if isinstance(value, bool):
+            if type(value) is bool:
                 if value:
-                    parts.append(f"{key}")
+                    append(key)
             elif value is None or value == "":
-                parts.append(f"{key}")
+                append(key)
             else:
-                parts.append(f"{key}={value}")
+                append(f"{key}={value}")
         return ", ".join(parts)
 
     # --- Data block generation ---
+    def _write_array(self, f, arr):
+        """
+        Write a 2-D numeric array to f as space-delimited rows.
+        Rows are formatted in chunks with a single %-operation each, so the per-value
+        formatting loop runs in C rather than in Python bytecode.
+        """
+        if arr.ndim == 1:
+            arr = arr[:, None]
+        ncols = arr.shape[1]
+        row_fmt = " ".join([_value_format(arr.dtype, self.precision)] * ncols) + "\n"
+        chunk_rows = max(1, _FORMAT_CHUNK_CELLS // max(1, ncols))
+        as_str = _uses_str(arr.dtype, self.precision)
+        for start in range(0, arr.shape[0], chunk_rows):
+            chunk = arr[start:start + chunk_rows]
+            if as_str:
+                chunk = chunk.astype(str)
+            f.write(_chunk_format(row_fmt, len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def _write_columns(self, f, columns):
+        """
+        Write equal-length 1-D numeric columns to f as space-delimited rows.
+        Columns of a single dtype are stacked and written by _write_array. Mixed columns
+        are copied chunk by chunk into an object array, so integer columns keep their
+        %d format instead of being upcast to float.
+        """
+        if not columns:
+            return
+        if len({col.dtype for col in columns}) == 1:
+            self._write_array(f, np.column_stack(columns))
+            return
+        ncols, nrows = len(columns), len(columns[0])
+        row_fmt = " ".join(_value_format(col.dtype, self.precision) for col in columns) + "\n"
+        chunk_rows = max(1, _FORMAT_CHUNK_CELLS // ncols)
+        as_str = [_uses_str(col.dtype, self.precision) for col in columns]
+        block = np.empty((min(chunk_rows, nrows), ncols), dtype=object)
+        for start in range(0, nrows, chunk_rows):
+            n = min(chunk_rows, nrows - start)
+            for j, col in enumerate(columns):
+                values = col[start:start + n]
+                block[:n, j] = values.astype(str) if as_str[j] else values
+            f.write(_chunk_format(row_fmt, n) % tuple(block[:n].ravel().tolist()))
+
+    @staticmethod
+    def _write_rows(f, rows):
+        """
+        Write an iterable of rows to f as space-delimited text using str() on each value.
+        A %s row template is built from the first row's length and reused for every row
+        of that length; rows of any other length are joined individually.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+        ncols = len(first)
+        row_fmt = " ".join(["%s"] * ncols) + "\n"
+        f.write(row_fmt % tuple(first))
+        f.writelines(
+            row_fmt % tuple(row) if len(row) == ncols else " ".join(map(str, row)) + "\n"
+            for row in rows
+        )
+
+    def _write_dataframe(self, f):
+        """Write the header line and rows of a pandas DataFrame to the file-like object f."""
+        if self._numeric_df is None:
+            self._numeric_df = all(_is_real_dtype(dt) for dt in self.data.dtypes)
+        if self._numeric_df:
+            f.write(" ".join(map(str, self.data.columns)) + "\n")
+            # Select by position: label lookup returns a frame for duplicate column names.
+            self._write_columns(f, [self.data.iloc[:, i].to_numpy() for i in range(self.data.shape[1])])
+        else:
+            float_format = None if self.precision is None else f"%.{self.precision}g"
+            self.data.to_csv(f, sep=' ', index=False, float_format=float_format)
+
+    def _write_dict(self, f):
+        """Write the header line and rows of a dict of columns to the file-like object f."""
+        columns = [np.asarray(col) for col in self.data.values()]
+        if len({len(col) for col in columns}) > 1:
+            raise ValueError("All columns in a dict must have the same length.")
+        f.write(" ".join(self.data.keys()) + "\n")
+        if all(_is_real_dtype(col.dtype) for col in columns):
+            self._write_columns(f, columns)
+        else:
+            self._write_rows(f, zip(*[self.data[col] for col in self.data]))
+
+    def _write_sequence(self, f):
+        """Write the header line and rows of a NumPy array or list-of-lists to the file-like object f."""
+        if self.header is None:
+            raise ValueError("A header must be provided when data is a numpy array or list-of-lists.")
+        f.write(" ".join(self.header) + "\n")
+        if isinstance(self.data, np.ndarray):
+            if self.data.ndim <= 2 and _is_real_dtype(self.data.dtype):
+                self._write_array(f, self.data)
+            else:
+                self._write_rows(f, self.data)
+            return
+        # Convert a list-of-lists column by column, so integer columns are not upcast to float.
+        if len({len(row) for row in self.data}) <= 1:
+            columns = [np.asarray(col) for col in zip(*self.data)]
+            if all(col.ndim == 1 and _is_real_dtype(col.dtype) for col in columns):
+                self._write_columns(f, columns)
+                return
+        self._write_rows(f, self.data)
+
+    def _write_data_block(self, f):
+        """Write the LaTeX filecontents* block containing the data to the file-like object f."""
+        f.write(f"\\begin{{filecontents*}}{{{self.data_filename}}}\n")
+        self._write_data(f)
+        f.write("\\end{filecontents*}\n")
+
     def generate_data_block(self):
         """
         Generate a LaTeX filecontents* block containing the data.
         The data is formatted as space-delimited text.
         """
-        if isinstance(self.data, pd.DataFrame):
-            data_str = self.data.to_csv(sep=' ', index=False)
-        elif isinstance(self.data, dict):
-            header_line = " ".join(self.data.keys())
-            rows = zip(*[self.data[col] for col in self.data])
-            data_lines = "\n".join(" ".join(map(str, row)) for row in rows)
-            data_str = header_line + "\n" + data_lines
-        elif isinstance(self.data, (np.ndarray, list)):
-            if self.header is None:
-                raise ValueError("A header must be provided when data is a numpy array or list-of-lists.")
-            header_line = " ".join(self.header)
-            data_list = self.data.tolist() if isinstance(self.data, np.ndarray) else self.data
-            data_lines = "\n".join(" ".join(map(str, row)) for row in data_list)
-            data_str = header_line + "\n" + data_lines
-        else:
-            raise TypeError("Unsupported data type. Provide a pandas DataFrame, dict, or numpy array/list-of-lists.")
-
-        return f"\\begin{{filecontents*}}{{{self.data_filename}}}\n{data_str}\n\\end{{filecontents*}}\n"
+        buf = io.StringIO()
+        self._write_data_block(buf)
+        return buf.getvalue()
 
     # --- TikZ picture generation ---
     def generate_tikz_picture(self):
         """
         Generate the LaTeX tikzpicture block with axis options and plot commands.
         """
-        axis_opts = "\n".join(f"      {k}={v}," for k, v in self.axis_options.items())
-        tikz = (
+        # Keyed on the option items, so direct edits to axis_options are picked up too.
+        axis_items = tuple(self.axis_options.items())
+        if self._axis_cache is None or self._axis_cache[0] != axis_items:
+            axis_opts = "\n".join(f"      {k}={v}," for k, v in axis_items)
+            self._axis_cache = (axis_items, axis_opts)
+        axis_opts = self._axis_cache[1]
+        parts = [
             "\\begin{figure}[H]\n"
             "\\centering\n"
             "\\begin{tikzpicture}\n"
             "\\centering\n"
-            "  \\begin{axis}[\n" +
-            axis_opts + "\n"
-            "    ]\n"
-        )
+            "  \\begin{axis}[\n",
+            axis_opts,
+            "\n    ]\n",
+        ]
         for line in self.plot_lines:
             if line.get("comment"):
-                tikz += f"    % {line['comment']}\n"
-            opts = self._format_options(line.get("options", {}))
-            tikz += (
-                f"    \\addplot[{opts}] table "
-                f"[x={line['table_x']}, y={line['table_y']}, col sep=space] "
-                f"{{{self.data_filename}}};\n"
-            )
-            tikz += f"    \\addlegendentry{{{line['legend']}}};\n\n"
-        tikz += (
+                parts.append(f"    % {line['comment']}\n")
+            parts.append(_PLOT_TMPL.format_map({
+                "opts": line["options_str"],
+                "x": line["table_x"],
+                "y": line["table_y"],
+                "file": self.data_filename,
+                "legend": line["legend"],
+            }))
+        parts.append(
             "  \\end{axis}\n"
             "\\end{tikzpicture}\n"
             "\\end{figure}\n"
         )
-        return tikz
+        return "".join(parts)
+
+    def _write_tikz_block(self, f):
+        """Write the tikzpicture block to the file-like object f."""
+        f.write(self.generate_tikz_picture())
 
     def generate_latex_code(self):
-        """Combine the data block and tikzpicture block into the complete LaTeX code."""
-        return self.generate_data_block() + "\n" + self.generate_tikz_picture()
+        """
+        Combine the data block and tikzpicture block into the complete LaTeX code.
+        With external_data=True only the tikzpicture block is returned.
+        """
+        if self.external_data:
+            return self.generate_tikz_picture()
+        buf = io.StringIO()
+        self._write_data_block(buf)
+        buf.write("\n")
+        self._write_tikz_block(buf)
+        return buf.getvalue()
 
     def save(self):
-        """Save the generated LaTeX code to the specified file."""
-        latex_code = self.generate_latex_code()
-        with open(self.latex_filename, 'w') as f:
-            f.write(latex_code)
+        """
+        Save the generated LaTeX code to the specified file.
+        The data and tikzpicture blocks are streamed to the file rather than built in memory first.
+        With external_data=True the data is written to data_filename as a plain table.
+        """
+        if self.external_data:
+            with open(self.data_filename, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
+                self._write_data(f)
+            print(f"Data saved to {self.data_filename}")
+        with open(self.latex_filename, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
+            if not self.external_data:
+                self._write_data_block(f)
+                f.write("\n")
+            self._write_tikz_block(f)
         print(f"LaTeX code saved to {self.latex_filename}")
-
-
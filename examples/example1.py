@@ -15,7 +15,8 @@ def main():
     strike_df = np.full(n_df, 40)
     callFD_df = np.sin(sigma_df) * 10         # Example function for callFD
     putFD_df = np.cos(sigma_df) * 10           # Example function for putFD
-    callMC_df = np.log(sigma_df + 1) * 10        # Example function for callMC
+    callMC_df = np.log1p(sigma_df)               # Example function for callMC
+    callMC_df *= 10
     putMC_df = np.sqrt(sigma_df) * 10            # Example function for putMC
 
     df = pd.DataFrame({
@@ -64,14 +65,16 @@ def main():
     # Example 2: Using a large NumPy array
     # ==============================
     n_np = 200  # Number of data points
-    sigma_np = np.linspace(0.1, 1.0, n_np)
-    strike_np = np.full(n_np, 40)
-    callFD_np = np.sin(sigma_np) * 10
-    putFD_np = np.cos(sigma_np) * 10
-    callMC_np = np.log(sigma_np + 1) * 10
-    putMC_np = np.sqrt(sigma_np) * 10
-
-    data_np = np.column_stack((strike_np, sigma_np, callFD_np, putFD_np, callMC_np, putMC_np))
+    # Fill the columns of a preallocated matrix in place instead of stacking temporaries.
+    data_np = np.empty((n_np, 6))
+    data_np[:, 0] = 40                             # strike
+    sigma_np = data_np[:, 1]
+    sigma_np[:] = np.linspace(0.1, 1.0, n_np)      # sigma
+    np.sin(sigma_np, out=data_np[:, 2])            # callFD
+    np.cos(sigma_np, out=data_np[:, 3])            # putFD
+    np.log1p(sigma_np, out=data_np[:, 4])          # callMC
+    np.sqrt(sigma_np, out=data_np[:, 5])           # putMC
+    data_np[:, 2:] *= 10
     header_np = ["strike", "sigma", "callFD", "putFD", "callMC", "putMC"]
 
     generator_np = PyTikzPlot(data_np, "numpy_data.txt", "numpy_plot_code.tex", header=header_np)
@@ -1,43 +1,62 @@
+import importlib.util
 import unittest
 import tempfile
 import os
-import pandas as pd
 import numpy as np
 from Py2Tikz import PyTikzPlot
+from Py2Tikz.py2tikz import _FORMAT_CHUNK_CELLS
+
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+
+# Keep test output in memory-backed storage when available.
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
 
 class TestLatexPlotGenerator(unittest.TestCase):
-    def setUp(self):
-        # Temporary file for LaTeX output
-        self.temp_latex_file = tempfile.NamedTemporaryFile(delete=False)
-        self.temp_latex_file.close()
-        self.data_filename = "temp_data.txt"
-
-    def tearDown(self):
-        if os.path.exists(self.temp_latex_file.name):
-            os.remove(self.temp_latex_file.name)
-        if os.path.exists(self.data_filename):
-            os.remove(self.data_filename)
+    # Shared input data; tests must not mutate it.
+    data_dict = {
+        "sigma": [0.1, 0.2, 0.3],
+        "callFD": [0.01, 0.02, 0.03]
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        # One temporary file for LaTeX output, shared by all tests. save() opens it
+        # with mode 'w', so every test that saves starts from an empty file.
+        cls.temp_latex_file = tempfile.NamedTemporaryFile(delete=False, dir=TEMP_DIR, suffix=".tex")
+        cls.temp_latex_file.close()
+        # Unique per process so parallel test workers never share a data file.
+        temp_data_file = tempfile.NamedTemporaryFile(
+            delete=False, dir=TEMP_DIR, prefix="py2tikz_data_", suffix=".txt"
+        )
+        temp_data_file.close()
+        cls.data_filename = temp_data_file.name
 
+    @classmethod
+    def tearDownClass(cls):
+        for path in (cls.temp_latex_file.name, cls.data_filename):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def assertAllIn(self, needles, haystack):
+        """Assert that every needle occurs in haystack, reporting each missing one separately."""
+        for needle in needles:
+            with self.subTest(needle=needle):
+                self.assertIn(needle, haystack)
+
+    @unittest.skipUnless(HAS_PANDAS, "pandas not installed")
     def test_generate_data_block_with_dataframe(self):
-        df = pd.DataFrame({
-            "sigma": [0.1, 0.2, 0.3],
-            "callFD": [0.01, 0.02, 0.03]
-        })
+        import pandas as pd
+        df = pd.DataFrame(self.data_dict)
         generator = PyTikzPlot(df, self.data_filename, self.temp_latex_file.name)
         data_block = generator.generate_data_block()
-        self.assertIn("\\begin{filecontents*}", data_block)
-        self.assertIn("sigma callFD", data_block)
-        self.assertIn("0.1 0.01", data_block)
+        self.assertAllIn(["\\begin{filecontents*}", "sigma callFD", "0.1 0.01"], data_block)
 
     def test_generate_data_block_with_dict(self):
-        data_dict = {
-            "sigma": [0.1, 0.2, 0.3],
-            "callFD": [0.01, 0.02, 0.03]
-        }
-        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        generator = PyTikzPlot(self.data_dict, self.data_filename, self.temp_latex_file.name)
         data_block = generator.generate_data_block()
-        self.assertIn("sigma callFD", data_block)
-        self.assertIn("0.2 0.02", data_block)
+        self.assertAllIn(["sigma callFD", "0.2 0.02"], data_block)
 
     def test_generate_data_block_with_numpy_array(self):
         np_array = np.array([[0.1, 0.01],
@@ -46,8 +65,7 @@ class TestLatexPlotGenerator(unittest.TestCase):
         header = ["sigma", "callFD"]
         generator = PyTikzPlot(np_array, self.data_filename, self.temp_latex_file.name, header=header)
         data_block = generator.generate_data_block()
-        self.assertIn("sigma callFD", data_block)
-        self.assertIn("0.3 0.03", data_block)
+        self.assertAllIn(["sigma callFD", "0.3 0.03"], data_block)
 
     def test_generate_data_block_with_list_of_lists(self):
         data_list = [
@@ -58,16 +76,97 @@ class TestLatexPlotGenerator(unittest.TestCase):
         header = ["sigma", "callFD"]
         generator = PyTikzPlot(data_list, self.data_filename, self.temp_latex_file.name, header=header)
         data_block = generator.generate_data_block()
-        self.assertIn("sigma callFD", data_block)
-        self.assertIn("0.2 0.02", data_block)
+        self.assertAllIn(["sigma callFD", "0.2 0.02"], data_block)
 
-    def test_generate_tikz_picture(self):
-        # Create a simple DataFrame.
-        df = pd.DataFrame({
-            "sigma": [0.1, 0.2, 0.3],
-            "callFD": [0.01, 0.02, 0.03]
-        })
+    def test_generate_data_block_across_chunks(self):
+        nrows = _FORMAT_CHUNK_CELLS // 2 + 3  # Two columns, so the rows span two chunks.
+        np_array = np.arange(nrows * 2).reshape(nrows, 2) / 4
+        generator = PyTikzPlot(np_array, self.data_filename, self.temp_latex_file.name, header=["a", "b"])
+        lines = generator.generate_data_block().splitlines()[2:-1]
+        self.assertEqual(len(lines), nrows)
+        np.testing.assert_array_equal(np.array([line.split() for line in lines], dtype=float), np_array)
+
+    def test_generate_data_block_with_integer_columns(self):
+        data_dict = {
+            "t": np.arange(1700000000, 1700000005),
+            "id": [12345678] * 5,
+            "y": [0.5, 1.5, 2.5, 3.5, 4.5]
+        }
+        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        data_block = generator.generate_data_block()
+        self.assertIn("1700000000 12345678 0.5", data_block)
+        self.assertIn("1700000004 12345678 4.5", data_block)
+        np_array = np.array([[2 ** 60, 1], [2 ** 60 + 1, 2]])
+        generator = PyTikzPlot(np_array, self.data_filename, self.temp_latex_file.name, header=["a", "b"])
+        self.assertIn("1152921504606846977 2", generator.generate_data_block())
+
+    @unittest.skipUnless(HAS_PANDAS, "pandas not installed")
+    def test_generate_data_block_with_mixed_dataframe(self):
+        import pandas as pd
+        df = pd.DataFrame({"id": [12345678, 12345679], "y": [0.5, 1.5]})
         generator = PyTikzPlot(df, self.data_filename, self.temp_latex_file.name)
+        self.assertIn("id y\n12345678 0.5\n12345679 1.5\n", generator.generate_data_block())
+
+    @unittest.skipUnless(HAS_PANDAS, "pandas not installed")
+    def test_generate_data_block_with_duplicate_dataframe_columns(self):
+        import pandas as pd
+        df = pd.DataFrame([[1, 2.5], [3, 4.5]], columns=["a", "a"])
+        generator = PyTikzPlot(df, self.data_filename, self.temp_latex_file.name)
+        self.assertIn("a a\n1 2.5\n3 4.5\n", generator.generate_data_block())
+
+    def test_generate_data_block_non_numeric(self):
+        data_dict = {
+            "label": ["a", "b"],
+            "x": [1, 2.5]
+        }
+        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        self.assertIn("label x\na 1\nb 2.5\n", generator.generate_data_block())
+        np_array = np.array([["a", 1], ["b", 2]], dtype=object)
+        generator = PyTikzPlot(np_array, self.data_filename, self.temp_latex_file.name, header=["label", "x"])
+        self.assertIn("label x\na 1\nb 2\n", generator.generate_data_block())
+
+    def test_generate_data_block_with_mixed_list_of_lists(self):
+        data_list = [[2 ** 60 + 1, 0.5], [3, 1.5]]
+        generator = PyTikzPlot(data_list, self.data_filename, self.temp_latex_file.name, header=["n", "y"])
+        self.assertIn("n y\n1152921504606846977 0.5\n3 1.5\n", generator.generate_data_block())
+        generator = PyTikzPlot([[True, 1]], self.data_filename, self.temp_latex_file.name, header=["b", "n"])
+        self.assertIn("b n\nTrue 1\n", generator.generate_data_block())
+
+    def test_generate_data_block_with_ragged_list_of_lists(self):
+        data_list = [[1, "a"], [2], [3, "c", "extra"]]
+        generator = PyTikzPlot(data_list, self.data_filename, self.temp_latex_file.name, header=["x", "y"])
+        self.assertIn("x y\n1 a\n2\n3 c extra\n", generator.generate_data_block())
+
+    def test_generate_data_block_precision(self):
+        data_dict = {
+            "sigma": [1 / 3, 2 / 3],
+            "callFD": [0.01, 0.02]
+        }
+        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        self.assertIn("0.3333333333333333 0.01", generator.generate_data_block())
+        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name, precision=3)
+        self.assertIn("0.667 0.02", generator.generate_data_block())
+
+    def test_generate_data_block_with_float32(self):
+        data_dict = {
+            "sigma": np.array([0.1, 0.2], dtype=np.float32),
+            "callFD": [0.01, 0.02]
+        }
+        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        self.assertIn("sigma callFD\n0.1 0.01\n0.2 0.02\n", generator.generate_data_block())
+        np_array = np.array([[0.1, 1 / 3]], dtype=np.float32)
+        generator = PyTikzPlot(np_array, self.data_filename, self.temp_latex_file.name, header=["a", "b"])
+        self.assertIn("a b\n0.1 0.33333334\n", generator.generate_data_block())
+
+    def test_generate_data_block_large_offset_is_lossless(self):
+        t = np.arange(1700000000, 1700000005, dtype=float) + 0.25
+        for data in ({"t": t, "y": [0.5, 1.5, 2.5, 3.5, 4.5]}, {"t": t, "n": np.arange(5)}):
+            generator = PyTikzPlot(data, self.data_filename, self.temp_latex_file.name)
+            lines = generator.generate_data_block().splitlines()[2:-1]
+            np.testing.assert_array_equal([float(line.split()[0]) for line in lines], t)
+
+    def test_generate_tikz_picture(self):
+        generator = PyTikzPlot(self.data_dict, self.data_filename, self.temp_latex_file.name)
         # Set some axis options via methods.
         generator.set_title("Test Plot")
         generator.set_labels("{$\\sigma$}", "{Price}")
@@ -79,17 +178,26 @@ class TestLatexPlotGenerator(unittest.TestCase):
         # Add a plot line.
         generator.add_plot_line("sigma", "callFD", "CallFD", comment="Test Plot Line", mark="o", color="blue", thick=True, mark_size="3pt")
         tikz_code = generator.generate_tikz_picture()
-        self.assertIn("\\begin{tikzpicture}", tikz_code)
-        self.assertIn("\\addplot", tikz_code)
-        self.assertIn("table [x=sigma, y=callFD", tikz_code)
-        self.assertIn("\\addlegendentry{CallFD}", tikz_code)
+        self.assertAllIn([
+            "\\begin{tikzpicture}",
+            "\\addplot",
+            "table [x=sigma, y=callFD",
+            "\\addlegendentry{CallFD}",
+        ], tikz_code)
+
+    def test_axis_options_updated_after_generation(self):
+        generator = PyTikzPlot(self.data_dict, self.data_filename, self.temp_latex_file.name)
+        generator.set_title("First")
+        self.assertIn("title={First}", generator.generate_tikz_picture())
+        generator.set_title("Second")
+        generator.set_xmin("0")
+        tikz_code = generator.generate_tikz_picture()
+        self.assertAllIn(["title={Second}", "xmin=0"], tikz_code)
+        generator.axis_options["xmax"] = "2"
+        self.assertIn("xmax=2", generator.generate_tikz_picture())
 
     def test_save_functionality(self):
-        data_dict = {
-            "sigma": [0.1, 0.2, 0.3],
-            "callFD": [0.01, 0.02, 0.03]
-        }
-        generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+        generator = PyTikzPlot(self.data_dict, self.data_filename, self.temp_latex_file.name)
         generator.set_title("Test Plot")
         generator.set_labels("{$\\sigma$}", "{Price}")
         generator.set_legend("north west")
@@ -98,14 +206,33 @@ class TestLatexPlotGenerator(unittest.TestCase):
         generator.save()
         with open(self.temp_latex_file.name, 'r') as f:
             content = f.read()
-        self.assertIn("\\begin{filecontents*}", content)
+        self.assertAllIn(["\\begin{filecontents*}", "\\begin{tikzpicture}"], content)
+
+    def test_save_external_data(self):
+        generator = PyTikzPlot(self.data_dict, self.data_filename, self.temp_latex_file.name, external_data=True)
+        generator.add_plot_line("sigma", "callFD", "CallFD")
+        generator.save()
+        with open(self.temp_latex_file.name, 'r') as f:
+            content = f.read()
+        with open(self.data_filename, 'r') as f:
+            data_content = f.read()
+        self.assertNotIn("\\begin{filecontents*}", content)
         self.assertIn("\\begin{tikzpicture}", content)
+        self.assertTrue(data_content.startswith("sigma callFD\n"))
+        self.assertIn("0.3 0.03", data_content)
 
     def test_invalid_data_type(self):
         with self.assertRaises(TypeError):
             generator = PyTikzPlot(123, self.data_filename, self.temp_latex_file.name)
             generator.generate_data_block()
 
+    def test_dict_with_unequal_column_lengths(self):
+        for data_dict in ({"sigma": [0.1, 0.2, 0.3], "callFD": [0.01, 0.02]},
+                          {"sigma": [0.1, 0.2, 0.3], "label": ["a", "b"]}):
+            generator = PyTikzPlot(data_dict, self.data_filename, self.temp_latex_file.name)
+            with self.assertRaises(ValueError):
+                generator.generate_data_block()
+
     def test_numpy_without_header(self):
         np_array = np.array([[0.1, 0.01], [0.2, 0.02]])
         with self.assertRaises(ValueError):